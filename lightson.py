@@ -12,14 +12,41 @@
 # the fewest number of steps.
 
 from collections import deque
+import functools
 import sys
-from typing import Generator, List, Optional, Tuple
+from typing import Callable, Deque, Dict, Generator, List, Optional, Set, Tuple
 
 
 Coordinates = Tuple[int, int]
 CoordinatesList = List[Coordinates]
 
 
+@functools.lru_cache(maxsize=None)
+def _import_numpy():
+    """
+    Returns the numpy module, or ``None`` if it is unavailable. numpy is optional and
+    only needed for large boards, so it is not imported until it is first used.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_bfs() -> Optional[Callable]:
+    """
+    Returns ``_bfs`` compiled with numba, or ``None`` if numba is unavailable. numba is
+    slow to import, so it is not imported until a search first needs it.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_bfs)
+
+
 class NoSolutionError:
     """
     Error raised when there is no solution for a given Lights On board.
@@ -35,6 +62,14 @@ class BoardState:
         (0, 1)   (1, 1)   (2, 1)
         (0, 2)   (1, 2)   (2, 2)
     """
+    #: Lists of all valid coordinates, keyed by ``(width, height)``. Each list is indexed
+    #: by the bit index of the coordinates in ``_board``.
+    _coordinates_cache: Dict[Tuple[int, int], CoordinatesList] = dict()
+
+    #: Lists of all valid coordinates, keyed by ``(width, height)``, in the order that
+    #: ``coordinates`` yields them: column by column.
+    _column_coordinates_cache: Dict[Tuple[int, int], CoordinatesList] = dict()
+
     def __init__(self, width: int, height: int) -> None:
         self.width = width
         self.height = height
@@ -54,15 +89,16 @@ class BoardState:
 
         #: The board is represented by a binary-encoded integer. The least-significant
         #: bit is the cell at (0, 0). The next most significant bit is the cell at
-        #: (0, 1), then (0, 2), (1, 0), and so on.
+        #: (1, 0), then (2, 0), (0, 1), and so on.
         self._board: int = 0
 
     def __eq__(self, other):
-        return all([
-            self._board == getattr(other, "_board", None),
-            self.width == getattr(other, "width", None),
-            self.height == getattr(other, "height", None),
-        ])
+        return (
+            isinstance(other, BoardState)
+            and self._board == other._board
+            and self.width == other.width
+            and self.height == other.height
+        )
 
     def __hash__(self):
         return self._board
@@ -73,7 +109,7 @@ class BoardState:
         Produces a BoardState with all lights on.
         """
         bs = BoardState(width, height)
-        bs._board = int("0b" + ("1" * width * height), base=2)
+        bs._board = (1 << (width * height)) - 1
         bs.steps_from_solution = 0
         bs.next_solution_coordinates = None
         bs.next_solution_board = None
@@ -91,19 +127,34 @@ class BoardState:
         Produces a bitmask suitable for inverting coordinates in the given ``coordinates_list``.
         """
         mask: int = 0
-        for coordinates in coordinates_list:
-            x, y = coordinates
-            bit = self._coordinates_bit(coordinates)
-            mask |= bit
+        width = self.width
+        for x, y in coordinates_list:
+            mask |= 1 << ((width * y) + x)
         return mask
 
+    @classmethod
+    def coordinates_list(cls, width: int, height: int) -> CoordinatesList:
+        """
+        Returns a list of all valid coordinates for a board of the given size, indexed
+        by the bit index of the coordinates. The list is cached and must not be modified.
+        """
+        coordinates_list = cls._coordinates_cache.get((width, height))
+        if coordinates_list is None:
+            coordinates_list = [(x, y) for y in range(height) for x in range(width)]
+            cls._coordinates_cache[(width, height)] = coordinates_list
+        return coordinates_list
+
     def coordinates(self) -> Generator[Coordinates, None, None]:
         """
-        Generator that yields all valid coordinates for this BoardState.
+        Generator that yields all valid coordinates for this BoardState, column by
+        column: (0, 0), (0, 1), ..., (1, 0), (1, 1), and so on.
         """
-        for x in range(self.width):
-            for y in range(self.height):
-                yield (x, y)
+        size = (self.width, self.height)
+        coordinates_list = self._column_coordinates_cache.get(size)
+        if coordinates_list is None:
+            coordinates_list = [(x, y) for x in range(self.width) for y in range(self.height)]
+            self._column_coordinates_cache[size] = coordinates_list
+        yield from coordinates_list
 
     def invert(self, coordinates_list: CoordinatesList) -> "BoardState":
         """
@@ -122,8 +173,8 @@ class BoardState:
         """
         Returns ``True`` if the coordinates are on, ``False`` otherwise.
         """
-        bit = self._coordinates_bit(coordinates)
-        return bool(self._board & bit)
+        x, y = coordinates
+        return bool((self._board >> ((self.width * y) + x)) & 1)
 
     @property
     def key(self) -> str:
@@ -144,17 +195,70 @@ class BoardClicker:
     """
     "Clicks" the cells on the board to produce a new BoardState.
     """
+    def __init__(self) -> None:
+        #: Precomputed click masks, keyed by ``(width, height)``. Each value is a list
+        #: indexed by the bit index of the clicked cell (``width * y + x``) holding the
+        #: mask of all cells that are toggled by the click.
+        self.click_masks: Dict[Tuple[int, int], List[int]] = dict()
+
+    def masks(self, width: int, height: int) -> List[int]:
+        """
+        Returns the list of click masks for a board of the given size, computing it if
+        necessary.
+        """
+        masks = self.click_masks.get((width, height))
+        if masks is None:
+            # Shifting a cell's bit by one moves it to the neighbouring column, but a cell
+            # on the edge would wrap around to the other side of the adjacent row. Masking
+            # out the edge column that a wrapped bit lands in prevents that without any
+            # bounds checks. Shifting by a whole row can only fall off the top or bottom.
+            full = (1 << (width * height)) - 1
+            left_edge = sum(1 << (width * y) for y in range(height))
+            not_left_edge = full & ~left_edge
+            not_right_edge = full & ~(left_edge << (width - 1))
+            masks = list()
+            for i in range(width * height):
+                bit = 1 << i
+                masks.append(
+                    bit
+                    | ((bit << 1) & not_left_edge)
+                    | ((bit >> 1) & not_right_edge)
+                    | ((bit << width) & full)
+                    | (bit >> width)
+                )
+            self.click_masks[(width, height)] = masks
+        return masks
+
     def click(self, board_state: BoardState, coordinates: Coordinates) -> BoardState:
         """
         Clicks at ``coordinates``, producing the next BoardState consistent with the
         rules of Lights Out.
         """
         x, y = coordinates
-        invert_coordinates = list(filter(
-            lambda c: board_state.valid_coordinates(c),
-            [(x - 1, y), (x, y), (x + 1, y), (x, y - 1), (x, y + 1)]
-        ))
-        return board_state.invert(invert_coordinates)
+        width = board_state.width
+        masks = self.masks(width, board_state.height)
+        bs = type(board_state)(width, board_state.height)
+        bs._board = board_state._board ^ masks[(width * y) + x]
+        return bs
+
+    def click_sequence(self, board_state: BoardState, coordinates_list: CoordinatesList) -> List[BoardState]:
+        """
+        Clicks at each of the coordinates in ``coordinates_list`` in turn, starting from
+        ``board_state``. Returns the chain of BoardStates produced, with each one linked
+        to the next via its ``next_solution_board`` and ``next_solution_coordinates``.
+        """
+        bs = type(board_state)(board_state.width, board_state.height)
+        bs._board = board_state._board
+        bs.steps_from_solution = len(coordinates_list)
+        board_states = [bs]
+        for coordinates in coordinates_list:
+            next_bs = self.click(bs, coordinates)
+            next_bs.steps_from_solution = bs.steps_from_solution - 1
+            bs.next_solution_coordinates = coordinates
+            bs.next_solution_board = next_bs
+            board_states.append(next_bs)
+            bs = next_bs
+        return board_states
 
 
 class BoardStateTextRenderer:
@@ -163,19 +267,14 @@ class BoardStateTextRenderer:
     """
     def _determine_cell_characters(self, board_state: BoardState) -> dict:
         cell_characters = dict()
-        nsc = board_state.next_solution_coordinates
-        if nsc is not None and board_state.is_set(nsc):
-            char = "-"
-        else:
-            char = "+"
-        cell_characters[board_state.next_solution_coordinates] = char
+        board = board_state._board
+        for i, coord in enumerate(BoardState.coordinates_list(board_state.width, board_state.height)):
+            cell_characters[coord] = "o" if (board >> i) & 1 else " "
 
-        for coord in board_state.coordinates():
-            if board_state.is_set(coord):
-                char = "o"
-            else:
-                char = " "
-            cell_characters.setdefault(coord, char)
+        nsc = board_state.next_solution_coordinates
+        if nsc is not None:
+            x, y = nsc
+            cell_characters[nsc] = "-" if (board >> ((board_state.width * y) + x)) & 1 else "+"
         return cell_characters
 
     def render(self, board_state: BoardState) -> str:
@@ -199,65 +298,497 @@ class BoardStateTextRenderer:
         return "\n".join(all_rows)
 
 
+#: An entry in a table of discovered boards: the number of steps the board is from
+#: the board the search started at, the integer representation of the next board in
+#: the chain back to that starting board and the bit index of the cell that must be
+#: clicked to get there. The latter two are ``None`` for the starting board itself.
+DiscoveredBoard = Tuple[int, Optional[int], Optional[int]]
+
+
 class LightsOnSolutionAlgorithm:
     """
     Calculates a solution to the lights on problem.
+
+    The solution is found with a bidirectional breadth-first search: one search starts
+    from the solution board and another from the board being solved. Every click is its
+    own inverse, so both searches apply the same click rules. They run until their
+    discovered boards meet.
+
+    If numba is available, boards with up to 64 cells are searched by the compiled
+    ``_bfs`` kernel instead, which keeps its search from the solution board in
+    ``compiled_searches``.
     """
+    #: A dictionary of all boards which have been discovered so far by searching from
+    #: the solution board, keyed by ``(width, height)``. Each value is a dictionary mapping
+    #: the integer board representation to its DiscoveredBoard entry. This contains boards
+    #: that are in the processing queue and those which have already been processed. It
+    #: is shared by all instances so that later searches can pick up where earlier ones
+    #: left off.
+    discovered_boards: Dict[Tuple[int, int], Dict[int, DiscoveredBoard]] = dict()
+
+    #: Queues containing the integer representations of boards that need to be processed
+    #: by the search from the solution board, keyed by ``(width, height)``.
+    board_processing_queues: Dict[Tuple[int, int], Deque[int]] = dict()
+
+    #: Board sizes for which the search from the solution board has discovered every
+    #: solvable board. Any board of these sizes that is not in ``discovered_boards``
+    #: is unsolvable.
+    fully_expanded: Set[Tuple[int, int]] = set()
+
+    #: The compiled counterpart of ``discovered_boards`` and ``board_processing_queues``,
+    #: keyed by ``(width, height)``. Each value is a list holding a typed dictionary
+    #: mapping each discovered board to the bit index of the cell clicked to discover
+    #: it, the typed queue of boards, the index of the next board to process and the
+    #: index at which the layer being processed ends. Once that index has reached the
+    #: end of the queue, every solvable board of that size has been discovered.
+    compiled_searches: Dict[Tuple[int, int], list] = dict()
+
     def __init__(self) -> None:
         self.clicker = BoardClicker()
 
-        #: A dictionary of all boards which have been discovered so far.
-        #: This contains boards that are in the processing queue and those
-        #: which have already been processed.
-        self.discovered_boards = dict()
-
-        #: A queue containing boards that need to be processed.
-        self.board_processing_queue = deque()
-
-    def _find_board_solution(self, board_state: BoardState) -> Optional[BoardState]:
-        existing_solution: BoardState = self.discovered_boards.get(board_state.key, None)
-        if existing_solution is not None:
-            return existing_solution
-        solution_board = BoardState.solution_board(board_state.width, board_state.height)
-        if self.discovered_boards.get(solution_board.key, None) is not None:
-            # We have already computed all solutions for this size board. The given BoardState
-            # is unsolvable.
+    def _solution_search_for(
+        self,
+        width: int,
+        height: int,
+    ) -> Tuple[Dict[int, DiscoveredBoard], Deque[int]]:
+        """
+        Returns the discovered boards and processing queue of the search from the solution
+        board of the given size, starting that search if necessary.
+        """
+        size = (width, height)
+        discovered_boards = self.discovered_boards.get(size)
+        if discovered_boards is None:
+            solution_board = BoardState.solution_board(width, height)._board
+            discovered_boards = {solution_board: (0, None, None)}
+            self.discovered_boards[size] = discovered_boards
+            self.board_processing_queues[size] = deque([solution_board])
+        return discovered_boards, self.board_processing_queues[size]
+
+    def _find_board_solution(self, board_state: BoardState) -> Optional[List[int]]:
+        """
+        Returns the bit indices of the cells that must be clicked, in order, to solve
+        ``board_state``, or ``None`` if it is unsolvable.
+        """
+        width, height = board_state.width, board_state.height
+        if width * height <= 64 and _compiled_bfs() is not None:
+            return self._find_compiled_board_solution(board_state)
+
+        masks = self.clicker.masks(width, height)
+        start = board_state._board
+        backward_boards, backward_queue = self._solution_search_for(width, height)
+        forward_boards = {start: (0, None, None)}
+
+        # An earlier search may have stopped part way through a layer of the search from
+        # the solution board. Finish that layer first: finding a solution with the fewest
+        # steps relies on every board up to the depth of its frontier being discovered.
+        if backward_queue and backward_boards[backward_queue[0]][0] != backward_boards[backward_queue[-1]][0]:
+            self._process_layer(backward_boards, backward_queue, masks, forward_boards)
+        if start in backward_boards:
+            return self._clicks_to_root(backward_boards, start)
+        if (width, height) in self.fully_expanded:
             return None
 
-        self.board_processing_queue.append(solution_board)
+        forward_queue = deque([start])
 
-        while len(self.board_processing_queue) > 0:
-            current_board = self.board_processing_queue.pop()
-            self._process_board_state(current_board)
+        # If either search runs out of boards to process before they meet, every board
+        # reachable from it has been discovered and the board is unsolvable.
+        while forward_queue and backward_queue:
+            if len(forward_queue) <= len(backward_queue):
+                meeting_board = self._process_layer(forward_boards, forward_queue, masks, backward_boards)
+            else:
+                meeting_board = self._process_layer(backward_boards, backward_queue, masks, forward_boards)
+            if meeting_board is not None:
+                forward_clicks = self._clicks_to_root(forward_boards, meeting_board)
+                forward_clicks.reverse()
+                return forward_clicks + self._clicks_to_root(backward_boards, meeting_board)
+
+        # If the search from this board ran out first, finish the search from the solution
+        # board too. Every board of this size is then either in ``discovered_boards`` or
+        # unsolvable, so later queries never need to search.
+        while backward_queue:
+            self._process_layer(backward_boards, backward_queue, masks, dict())
+        self.fully_expanded.add((width, height))
+        return None
+
+    def _find_compiled_board_solution(self, board_state: BoardState) -> Optional[List[int]]:
+        """
+        Equivalent to ``_find_board_solution``, but searches with the numba-compiled
+        ``_bfs`` kernel and resumes the search in ``compiled_searches``.
+        """
+        import numpy as np
+        from numba import types as numba_types
+        from numba.typed import Dict as NumbaDict, List as NumbaList
+
+        width, height = board_state.width, board_state.height
+        search = self.compiled_searches.get((width, height))
+        if search is None:
+            solution_board = np.uint64(BoardState.solution_board(width, height)._board)
+            backward_boards = NumbaDict.empty(key_type=numba_types.uint64, value_type=numba_types.int64)
+            backward_boards[solution_board] = -1
+            backward_queue = NumbaList.empty_list(numba_types.uint64)
+            backward_queue.append(solution_board)
+            search = [backward_boards, backward_queue, 0, 0]
+            self.compiled_searches[(width, height)] = search
+
+        start = np.uint64(board_state._board)
+        forward_boards = NumbaDict.empty(key_type=numba_types.uint64, value_type=numba_types.int64)
+        forward_boards[start] = -1
+        forward_queue = NumbaList.empty_list(numba_types.uint64)
+        forward_queue.append(start)
+        clicks = NumbaList.empty_list(numba_types.int64)
+        masks = np.array(self.clicker.masks(width, height), dtype=np.uint64)
+        bfs = _compiled_bfs()
+        solvable, search[2], search[3] = bfs(masks, forward_boards, forward_queue, *search, clicks)
+        return [int(c) for c in clicks] if solvable else None
+
+    def find_solution(self, board_state: BoardState) -> Optional[List[BoardState]]:
+        clicks = self._find_board_solution(board_state)
+        if clicks is None:
+            return None
+
+        # Replay the clicks from the board that we start with to provide a nifty list.
+        coordinates_list = BoardState.coordinates_list(board_state.width, board_state.height)
+        return self.clicker.click_sequence(board_state, [coordinates_list[i] for i in clicks])
 
-        return self.discovered_boards.get(board_state.key, None)
+    def _clicks_to_root(self, discovered_boards: Dict[int, DiscoveredBoard], board: int) -> List[int]:
+        """
+        Returns the bit indices of the cells that must be clicked, in order, to get from
+        ``board`` back to the board that the search in ``discovered_boards`` started at.
+        """
+        clicks = list()
+        _, next_board, click_index = discovered_boards[board]
+        while next_board is not None:
+            clicks.append(click_index)
+            _, next_board, click_index = discovered_boards[next_board]
+        return clicks
+
+    def _process_layer(
+        self,
+        discovered_boards: Dict[int, DiscoveredBoard],
+        board_processing_queue: Deque[int],
+        masks: List[int],
+        other_discovered_boards: Dict[int, DiscoveredBoard],
+    ) -> Optional[int]:
+        """
+        Processes every board in ``board_processing_queue`` that is the fewest steps
+        from the start of its search, stopping early if the searches meet.
+
+        Returns the first newly discovered board that is known to the other search, or
+        ``None`` if there is none. Every board is checked against the other search when
+        it is first discovered, so had there been a shorter solution the searches would
+        have met in an earlier layer. Any meeting board is on a solution with the fewest
+        steps.
+        """
+        steps = discovered_boards[board_processing_queue[0]][0]
+        while board_processing_queue and discovered_boards[board_processing_queue[0]][0] == steps:
+            board = board_processing_queue.popleft()
+            meeting_board = self._process_board_state(
+                board, discovered_boards, board_processing_queue, masks, other_discovered_boards
+            )
+            if meeting_board is not None:
+                return meeting_board
+        return None
+
+    def _process_board_state(
+        self,
+        board: int,
+        discovered_boards: Dict[int, DiscoveredBoard],
+        board_processing_queue: Deque[int],
+        masks: List[int],
+        other_discovered_boards: Dict[int, DiscoveredBoard],
+    ) -> Optional[int]:
+        """
+        Discovers every board one click away from ``board``. Returns the first newly
+        discovered board that is known to the other search, or ``None`` if there is none.
+
+        Every board one click away is discovered even after the searches meet so that
+        ``board`` never has to be processed again.
+        """
+        meeting_board = None
+        steps = discovered_boards[board][0] + 1
+        for i, mask in enumerate(masks):
+            potential_new_board = board ^ mask
+
+            # Every click costs one step and boards are processed in FIFO order, so the
+            # first time a board is discovered is already via the fewest steps. There is
+            # never a better solution to replace it with later.
+            if potential_new_board not in discovered_boards:
+                board_processing_queue.append(potential_new_board)
+                discovered_boards[potential_new_board] = (steps, board, i)
+                if meeting_board is None and potential_new_board in other_discovered_boards:
+                    meeting_board = potential_new_board
+        return meeting_board
+
+
+class LightsOnLinearAlgebraAlgorithm:
+    """
+    Calculates a solution to the lights on problem by solving a system of linear
+    equations over GF(2).
+
+    Clicking a cell twice undoes the first click and the order of clicks does not
+    matter, so a solution is just the set of cells to click. A cell ends up toggled
+    once for every clicked cell whose click mask contains it. Click masks are
+    symmetric, so the click mask of each cell is also the row of the equation for
+    that cell, with the cell's bit of ``board XOR solution board`` as its result.
+
+    Solving the equations is polynomial in the number of cells, but finding the
+    solution with the fewest clicks means checking all ``2 ** k`` solutions, where
+    ``k`` is the dimension of the null space. ``k`` is small for most board sizes,
+    but it is 20 for 30x30 boards and 30 for 47x47 boards, which are impractical.
+    """
+    #: Boards with at least this many cells are solved with numpy when it is available.
+    #: Smaller boards are faster to solve with Python ints than to pack into arrays.
+    numpy_min_cells = 256
+
+    def __init__(self) -> None:
+        self.clicker = BoardClicker()
+
+    def _equations(self, width: int, height: int, board: int) -> List[int]:
+        """
+        Returns the equations for ``board``. Each row holds the coefficients of one
+        equation in its low ``width * height`` bits and the result of the equation in
+        the bit above them.
+        """
+        target = board ^ BoardState.solution_board(width, height)._board
+        result_bit = 1 << (width * height)
+        masks = self.clicker.masks(width, height)
+        return [mask | (result_bit if (target >> i) & 1 else 0) for i, mask in enumerate(masks)]
+
+    def _solve(self, width: int, height: int, board: int) -> Optional[Tuple[int, List[int]]]:
+        """
+        Solves the equations for ``board`` with Gauss-Jordan elimination.
+
+        Returns a click vector that solves the board along with a basis of the null
+        space of the equations, or ``None`` if the board is unsolvable. Adding (XOR-ing)
+        any combination of the null space basis to the click vector gives another
+        solution.
+        """
+        cells = width * height
+        result_bit = 1 << cells
+        rows = self._equations(width, height, board)
+
+        pivot_columns = list()
+        for column in range(cells):
+            column_bit = 1 << column
+            rank = len(pivot_columns)
+            pivot = next((r for r in range(rank, cells) if rows[r] & column_bit), None)
+            if pivot is None:
+                continue
+            rows[rank], rows[pivot] = rows[pivot], rows[rank]
+            pivot_row = rows[rank]
+            for r in range(cells):
+                if r != rank and rows[r] & column_bit:
+                    rows[r] ^= pivot_row
+            pivot_columns.append(column)
+
+        # Any remaining rows have no coefficients left. If one of them still has a result,
+        # the equations are inconsistent.
+        rank = len(pivot_columns)
+        if any(row & result_bit for row in rows[rank:]):
+            return None
+
+        clicks = 0
+        for row, column in zip(rows, pivot_columns):
+            if row & result_bit:
+                clicks |= 1 << column
+
+        null_space = list()
+        pivot_column_set = set(pivot_columns)
+        for free_column in range(cells):
+            if free_column in pivot_column_set:
+                continue
+            vector = 1 << free_column
+            for row, column in zip(rows, pivot_columns):
+                if (row >> free_column) & 1:
+                    vector |= 1 << column
+            null_space.append(vector)
+        return clicks, null_space
+
+    def _solve_numpy(
+        self,
+        width: int,
+        height: int,
+        board: int,
+    ) -> Optional[Tuple[int, List[int]]]:
+        """
+        Equivalent to ``_solve``, but packs the equations into a matrix of ``uint64`` words
+        so that each elimination step is a single vectorized XOR over all of the rows that
+        depend on the pivot. The click vector and null space basis are returned as
+        Python ints, just as with ``_solve``.
+        """
+        np = _import_numpy()
+        cells = width * height
+        # One extra bit holds the result of each equation, as in ``_equations``.
+        words = (cells + 64) // 64
+        word_mask = (1 << 64) - 1
+        rows = self._equations(width, height, board)
+        matrix = np.array([[(row >> (64 * w)) & word_mask for w in range(words)] for row in rows], dtype=np.uint64)
+        one = np.uint64(1)
+
+        def column_bits(rows: "np.ndarray", column: int) -> "np.ndarray":
+            return (rows[:, column >> 6] >> np.uint64(column & 63)) & one
+
+        pivot_columns = list()
+        for column in range(cells):
+            rank = len(pivot_columns)
+            candidates = np.flatnonzero(column_bits(matrix[rank:], column))
+            if candidates.size == 0:
+                continue
+            pivot = rank + int(candidates[0])
+            if pivot != rank:
+                matrix[[rank, pivot]] = matrix[[pivot, rank]]
+            dependent_rows = column_bits(matrix, column).astype(bool)
+            dependent_rows[rank] = False
+            matrix[dependent_rows] ^= matrix[rank]
+            pivot_columns.append(column)
+
+        rank = len(pivot_columns)
+        if column_bits(matrix[rank:], cells).any():
+            return None
+
+        def vector(columns: List[int]) -> int:
+            v = 0
+            for column in columns:
+                v |= 1 << column
+            return v
+
+        pivot_rows = matrix[:rank]
+        results = column_bits(pivot_rows, cells)
+        clicks = vector([column for column, result in zip(pivot_columns, results) if result])
+
+        null_space = list()
+        pivot_column_set = set(pivot_columns)
+        for free_column in range(cells):
+            if free_column in pivot_column_set:
+                continue
+            coefficients = column_bits(pivot_rows, free_column)
+            null_space.append(vector(
+                [free_column] + [column for column, c in zip(pivot_columns, coefficients) if c]
+            ))
+        return clicks, null_space
+
+    def _find_board_solution(self, board_state: BoardState) -> Optional[int]:
+        """
+        Returns the click vector that solves ``board_state`` with the fewest clicks, or
+        ``None`` if it is unsolvable. This takes time exponential in the dimension of
+        the null space.
+        """
+        cells = board_state.width * board_state.height
+        use_numpy = cells >= self.numpy_min_cells and _import_numpy() is not None
+        solve = self._solve_numpy if use_numpy else self._solve
+        solved = solve(board_state.width, board_state.height, board_state._board)
+        if solved is None:
+            return None
+        clicks, null_space = solved
+
+        # Every solution is the click vector plus some combination of the null space basis.
+        # Walking the combinations in Gray code order changes one basis vector at a time,
+        # namely the one at the lowest set bit of the combination's index, so each
+        # solution is a single XOR away from the last. int.bit_count() counts its clicks.
+        best = clicks
+        best_count = clicks.bit_count()
+        candidate = clicks
+        for combination in range(1, 1 << len(null_space)):
+            candidate ^= null_space[(combination & -combination).bit_length() - 1]
+            candidate_count = candidate.bit_count()
+            if candidate_count < best_count:
+                best = candidate
+                best_count = candidate_count
+        return best
 
     def find_solution(self, board_state: BoardState) -> Optional[List[BoardState]]:
-        # This gives us the BoardState that we start with. We can walk the BoardState objects
-        # to provide a nifty list.
-        current_bs = self._find_board_solution(board_state)
-        solution_list = list()
-
-        while current_bs is not None:
-            solution_list.append(current_bs)
-            current_bs = current_bs.next_solution_board
-        return solution_list or None
-
-    def _process_board_state(self, board_state: BoardState) -> None:
-        for c in board_state.coordinates():
-            potential_new_board: BoardState = self.clicker.click(board_state, c)
-            potential_new_board.steps_from_solution = board_state.steps_from_solution + 1
-            potential_new_board.next_solution_coordinates = c
-            potential_new_board.next_solution_board = board_state
-
-            # If this board state has not yet been discovered, record it.
-            # Otherwise, only replace it if we have found a better solution (i.e. fewer steps).
-            existing_discovered_board = self.discovered_boards.get(potential_new_board.key, None)
-            if existing_discovered_board is None:
-                self.board_processing_queue.append(potential_new_board)
-                self.discovered_boards[potential_new_board.key] = potential_new_board
-            elif existing_discovered_board.steps_from_solution > potential_new_board.steps_from_solution:
-                self.discovered_boards[potential_new_board.key] = potential_new_board
+        clicks = self._find_board_solution(board_state)
+        if clicks is None:
+            return None
+
+        coordinates_list = BoardState.coordinates_list(board_state.width, board_state.height)
+        return self.clicker.click_sequence(
+            board_state, [c for i, c in enumerate(coordinates_list) if (clicks >> i) & 1]
+        )
+
+
+def _bfs(
+    masks,
+    forward_boards,
+    forward_queue,
+    backward_boards,
+    backward_queue,
+    backward_head,
+    backward_layer_end,
+    clicks,
+):
+    """
+    Counterpart of ``LightsOnSolutionAlgorithm._find_board_solution`` for boards that
+    fit in a ``uint64``, written to be compiled by numba (see ``_compiled_bfs``).
+    ``masks`` is a ``uint64`` array of click masks.
+
+    Each search is a typed dictionary mapping every board it has discovered to the
+    bit index of the cell clicked to discover it (``-1`` for the board the search
+    started at), along with a typed list of boards it has queued. The board a board
+    was discovered from is recovered by clicking its cell again. ``forward_boards``
+    and ``forward_queue`` hold only the board being solved. The search from the
+    solution board is resumed at ``backward_head``, the index of the next board to
+    process, with its current layer ending at ``backward_layer_end``. It is updated
+    in place.
+
+    Appends to ``clicks`` the bit indices of the cells that must be clicked, in
+    order, to solve the board. Returns whether the board is solvable along with the
+    new ``backward_head`` and ``backward_layer_end``.
+    """
+    start = forward_queue[0]
+    forward_head = 0
+    forward_layer_end = 0
+    meeting_board = start
+    met = start in backward_boards
+    while not met and backward_head < len(backward_queue):
+        # Process a layer of the search with the smaller frontier, as the pure-Python
+        # search does. A layer of the search from the solution board that an earlier
+        # search stopped part way through is finished first. Once the search from the
+        # board runs dry, the board is unsolvable and the search from the solution
+        # board is finished so that no later search of this size needs to run.
+        forward_left = len(forward_queue) - forward_head
+        backward_side = (
+            backward_head < backward_layer_end
+            or forward_left == 0
+            or forward_left > len(backward_queue) - backward_head
+        )
+        if backward_side:
+            discovered_boards, queue, other_discovered_boards = backward_boards, backward_queue, forward_boards
+            head, layer_end = backward_head, backward_layer_end
+        else:
+            discovered_boards, queue, other_discovered_boards = forward_boards, forward_queue, backward_boards
+            head, layer_end = forward_head, forward_layer_end
+        if head == layer_end:
+            layer_end = len(queue)
+
+        while not met and head < layer_end:
+            board = queue[head]
+            head += 1
+            for i in range(masks.shape[0]):
+                new_board = board ^ masks[i]
+                if new_board not in discovered_boards:
+                    discovered_boards[new_board] = i
+                    queue.append(new_board)
+                    if not met and new_board in other_discovered_boards:
+                        met = True
+                        meeting_board = new_board
+
+        if backward_side:
+            backward_head, backward_layer_end = head, layer_end
+        else:
+            forward_head, forward_layer_end = head, layer_end
+
+    if met:
+        board = meeting_board
+        while forward_boards[board] != -1:
+            clicks.append(forward_boards[board])
+            board ^= masks[forward_boards[board]]
+        clicks.reverse()
+        board = meeting_board
+        while backward_boards[board] != -1:
+            clicks.append(backward_boards[board])
+            board ^= masks[backward_boards[board]]
+    return met, backward_head, backward_layer_end
 
 
 def parse_board_string(s: str) -> BoardState:
@@ -292,7 +823,7 @@ def parse_board_string(s: str) -> BoardState:
 
 if __name__ == "__main__":
     renderer = BoardStateTextRenderer()
-    algorithm = LightsOnSolutionAlgorithm()
+    algorithm = LightsOnLinearAlgebraAlgorithm()
     try:
         bs = parse_board_string(" ".join(sys.argv[1:]))
     except IndexError: